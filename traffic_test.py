@@ -2,20 +2,20 @@
 """
 E-University Network Lab - End-to-End Traffic Test
 
-Generates real traffic between all hosts, measures throughput using interface
-counters, and collects path information via traceroute. Outputs structured
-JSON data suitable for visualization.
+Generates real traffic between all hosts, measures throughput from the bytes
+each extended ping delivers, and collects path information via traceroute.
+Outputs structured JSON data suitable for visualization.
 
 Tests performed:
 1. Full mesh connectivity between all 6 hosts
 2. Throughput measurement via high-volume extended pings (1500-byte packets)
 3. Path analysis via traceroute
-4. Interface counter collection (bytes in/out)
 
 Usage:
     python traffic_test.py                  # Run full mesh test
     python traffic_test.py --quick          # Quick connectivity check only
     python traffic_test.py --output FILE    # Save JSON to specific file
+    python traffic_test.py --pretty         # Indent the JSON output
 
 Output JSON structure:
 {
@@ -30,12 +30,14 @@ Output JSON structure:
 import argparse
 import json
 import os
+import queue
 import re
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 import yaml
 from dotenv import load_dotenv
@@ -77,6 +79,17 @@ def load_hosts_from_testbed():
 
 HOSTS = load_hosts_from_testbed()
 
+# Host metadata for the JSON output, built once since HOSTS is fixed at load time
+_HOSTS_META = {
+    name: {
+        "ip": cfg["host_ip"],
+        "mgmt_ip": cfg["mgmt_ip"],
+        "campus": cfg["campus"],
+        "edge_router": cfg["edge_router"],
+    }
+    for name, cfg in HOSTS.items()
+}
+
 CREDENTIALS = {
     "username": os.getenv("DEVICE_USERNAME", "admin"),
     "password": os.getenv("DEVICE_PASSWORD"),
@@ -86,6 +99,21 @@ CREDENTIALS = {
 PING_COUNT = 100         # Number of pings for throughput test
 PING_SIZE = 1400         # Packet size (bytes) - MTU minus headers
 PING_TIMEOUT = 2         # Ping timeout in seconds
+SESSIONS_PER_HOST = 3    # Concurrent SSH sessions per source (IOS allows 5 VTYs)
+MAX_SESSIONS = 6         # Cap on SSH sessions open across all sources at once
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for the JSON results file
+
+# Traceroute hop line: "  1 10.0.0.1 4 msec" or "  1 10.0.0.1 [MPLS: Label X]"
+HOP_PATTERN = re.compile(
+    r'^\s*(\d+)\s+(\d+\.\d+\.\d+\.\d+|\*)\s+(?:(\d+)\s*msec)?(?:.*\[MPLS: Label (\d+))?',
+    re.MULTILINE
+)
+
+# Messages from worker threads (connection failures), printed by the main thread
+PROGRESS = queue.Queue()
+
+# Session slots shared by all sources; see test_host_to_all
+_SESSION_SLOTS = threading.BoundedSemaphore(MAX_SESSIONS)
 
 
 @dataclass
@@ -111,7 +139,6 @@ class TracerouteResult:
     destination: str
     dest_ip: str
     hops: list = field(default_factory=list)
-    total_hops: int = 0
     success: bool = False
     error: Optional[str] = None
 
@@ -144,12 +171,24 @@ def get_connection(host_name: str) -> Optional[ConnectHandler]:
     try:
         conn = ConnectHandler(**device)
         conn.enable()
+        # Discover the prompt once so later commands can skip find_prompt()
+        conn.set_base_prompt()
         return conn
     except Exception as e:
-        print(f"  ! Connection to {host_name} failed: {e}")
+        PROGRESS.put(f"  ! Connection to {host_name} failed: {e}")
         return None
 
 
+def send(conn: ConnectHandler, cmd: str, read_timeout: float = 10) -> str:
+    """Send a command, matching on the prompt stashed by get_connection"""
+    return conn.send_command(
+        cmd,
+        read_timeout=read_timeout,
+        expect_string=re.escape(conn.base_prompt),
+        auto_find_prompt=False,
+    )
+
+
 def run_ping(conn: ConnectHandler, source_name: str, dest_name: str,
              count: int = 5, size: int = 100) -> PingResult:
     """Execute ping and parse results"""
@@ -163,24 +202,8 @@ def run_ping(conn: ConnectHandler, source_name: str, dest_name: str,
     try:
         # Extended ping with specific count and size
         cmd = f"ping {dest_ip} repeat {count} size {size} timeout {PING_TIMEOUT}"
-        output = conn.send_command(cmd, read_timeout=count * PING_TIMEOUT + 30)
-
-        # Parse success rate
-        # Format: "Success rate is X percent (Y/Z)"
-        rate_match = re.search(r'Success rate is (\d+) percent \((\d+)/(\d+)\)', output)
-        if rate_match:
-            result.packets_received = int(rate_match.group(2))
-            result.packets_sent = int(rate_match.group(3))
-            result.packet_loss_pct = 100.0 - float(rate_match.group(1))
-            result.success = result.packets_received > 0
-
-        # Parse round-trip times
-        # Format: "round-trip min/avg/max = X/Y/Z ms"
-        rtt_match = re.search(r'round-trip min/avg/max = ([\d.]+)/([\d.]+)/([\d.]+)', output)
-        if rtt_match:
-            result.min_ms = float(rtt_match.group(1))
-            result.avg_ms = float(rtt_match.group(2))
-            result.max_ms = float(rtt_match.group(3))
+        output = send(conn, cmd, read_timeout=count * PING_TIMEOUT + 30)
+        parse_ping(output, result)
 
     except Exception as e:
         result.error = str(e)
@@ -188,6 +211,28 @@ def run_ping(conn: ConnectHandler, source_name: str, dest_name: str,
     return result
 
 
+def parse_ping(output: str, result: PingResult) -> PingResult:
+    """Fill a PingResult from IOS ping output"""
+    # Parse success rate
+    # Format: "Success rate is X percent (Y/Z)"
+    rate_match = re.search(r'Success rate is (\d+) percent \((\d+)/(\d+)\)', output)
+    if rate_match:
+        result.packets_received = int(rate_match.group(2))
+        result.packets_sent = int(rate_match.group(3))
+        result.packet_loss_pct = 100.0 - float(rate_match.group(1))
+        result.success = result.packets_received > 0
+
+    # Parse round-trip times
+    # Format: "round-trip min/avg/max = X/Y/Z ms"
+    rtt_match = re.search(r'round-trip min/avg/max = ([\d.]+)/([\d.]+)/([\d.]+)', output)
+    if rtt_match:
+        result.min_ms = float(rtt_match.group(1))
+        result.avg_ms = float(rtt_match.group(2))
+        result.max_ms = float(rtt_match.group(3))
+
+    return result
+
+
 def run_traceroute(conn: ConnectHandler, source_name: str, dest_name: str) -> TracerouteResult:
     """Execute traceroute and parse path"""
     dest_ip = HOSTS[dest_name]["host_ip"]
@@ -199,33 +244,20 @@ def run_traceroute(conn: ConnectHandler, source_name: str, dest_name: str) -> Tr
 
     try:
         cmd = f"traceroute {dest_ip} timeout 2 probe 1"
-        output = conn.send_command(cmd, read_timeout=120)
-
-        # Parse each hop
-        # Format: "  1 10.0.0.1 4 msec" or "  1 10.0.0.1 [MPLS: Label X]"
-        hop_pattern = re.compile(
-            r'^\s*(\d+)\s+(\d+\.\d+\.\d+\.\d+|\*)\s+(?:(\d+)\s*msec)?(?:.*\[MPLS: Label (\d+))?',
-            re.MULTILINE
-        )
-
-        hops = []
-        for match in hop_pattern.finditer(output):
-            hop_num = int(match.group(1))
-            hop_ip = match.group(2)
-            latency = float(match.group(3)) if match.group(3) else None
-            mpls_label = int(match.group(4)) if match.group(4) else None
-
-            hop_data = {
-                "hop": hop_num,
-                "ip": hop_ip,
-                "latency_ms": latency,
+        output = send(conn, cmd, read_timeout=120)
+
+        # Parse each hop; hops without a label carry mpls_label=None
+        hops = [
+            {
+                "hop": int(m[1]),
+                "ip": m[2],
+                "latency_ms": float(m[3]) if m[3] else None,
+                "mpls_label": int(m[4]) if m[4] else None,
             }
-            if mpls_label:
-                hop_data["mpls_label"] = mpls_label
-            hops.append(hop_data)
+            for m in HOP_PATTERN.finditer(output)
+        ]
 
         result.hops = hops
-        result.total_hops = len(hops)
         result.success = len(hops) > 0 and hops[-1]["ip"] == dest_ip
 
     except Exception as e:
@@ -234,47 +266,32 @@ def run_traceroute(conn: ConnectHandler, source_name: str, dest_name: str) -> Tr
     return result
 
 
-def get_interface_counters(conn: ConnectHandler) -> dict:
-    """Get interface byte counters for Gi0/0"""
-    try:
-        output = conn.send_command("show interface GigabitEthernet0/0 | include packets input|packets output")
-
-        # Parse input/output packet counts and bytes
-        # Format: "X packets input, Y bytes, Z no buffer"
-        in_match = re.search(r'(\d+) packets input, (\d+) bytes', output)
-        out_match = re.search(r'(\d+) packets output, (\d+) bytes', output)
-
-        return {
-            "bytes_in": int(in_match.group(2)) if in_match else 0,
-            "bytes_out": int(out_match.group(2)) if out_match else 0,
-            "packets_in": int(in_match.group(1)) if in_match else 0,
-            "packets_out": int(out_match.group(1)) if out_match else 0,
-        }
-    except Exception:
-        return {"bytes_in": 0, "bytes_out": 0, "packets_in": 0, "packets_out": 0}
-
+def measure_throughput(conn: ConnectHandler, source_name: str,
+                       dest_name: str) -> Tuple[ThroughputResult, PingResult]:
+    """Measure throughput by sending high-volume traffic and timing it.
 
-def measure_throughput(conn: ConnectHandler, source_name: str, dest_name: str) -> ThroughputResult:
-    """Measure throughput by sending high-volume traffic and measuring counters"""
+    Throughput is taken from the bytes this ping delivered rather than the
+    source's interface counters, which other sessions to the same source
+    also move while this one runs. The ping statistics are returned as well,
+    so the caller can use them for connectivity without a separate ping.
+    """
     dest_ip = HOSTS[dest_name]["host_ip"]
     result = ThroughputResult(source=source_name, destination=dest_name)
+    ping = PingResult(source=source_name, destination=dest_name, dest_ip=dest_ip)
 
     try:
-        # Get counters before
-        before = get_interface_counters(conn)
         start_time = time.time()
 
         # Send high-volume ping traffic (large packets, many repetitions)
         cmd = f"ping {dest_ip} repeat {PING_COUNT} size {PING_SIZE} timeout {PING_TIMEOUT}"
-        output = conn.send_command(cmd, read_timeout=PING_COUNT * PING_TIMEOUT + 60)
+        output = send(conn, cmd, read_timeout=PING_COUNT * PING_TIMEOUT + 60)
+        parse_ping(output, ping)
 
-        end_time = time.time()
-        # Get counters after
-        after = get_interface_counters(conn)
+        duration = time.time() - start_time
 
-        # Calculate throughput
-        bytes_sent = after["bytes_out"] - before["bytes_out"]
-        duration = end_time - start_time
+        # IOS ping size is the full IP datagram, so each echo answered is
+        # PING_SIZE bytes on the wire
+        bytes_sent = ping.packets_received * PING_SIZE
 
         if duration > 0 and bytes_sent > 0:
             result.bytes_sent = bytes_sent
@@ -284,14 +301,42 @@ def measure_throughput(conn: ConnectHandler, source_name: str, dest_name: str) -
             result.throughput_mbps = round(result.throughput_bps / 1_000_000, 4)
             result.success = True
 
-    except Exception:
+    except Exception as e:
         result.success = False
+        ping.error = str(e)
+
+    return result, ping
 
-    return result
+
+def test_destinations(conn: ConnectHandler, source_name: str, dest_names: list,
+                      quick: bool = False) -> dict:
+    """Run the per-destination tests for a slice of destinations over one session"""
+    dest_results = {}
+    for dest_name in dest_names:
+        if quick:
+            # Quick ping for connectivity
+            ping = run_ping(conn, source_name, dest_name, count=5, size=100)
+            dest_results[dest_name] = (asdict(ping), None, None)
+            continue
+
+        # Full throughput test; its ping statistics double as connectivity
+        throughput, ping = measure_throughput(conn, source_name, dest_name)
+
+        # Traceroute for path
+        trace = run_traceroute(conn, source_name, dest_name)
+        trace_data = asdict(trace)
+        trace_data["total_hops"] = len(trace.hops)
+        dest_results[dest_name] = (asdict(ping), asdict(throughput), trace_data)
+
+    return dest_results
 
 
 def test_host_to_all(source_name: str, all_hosts: list, quick: bool = False) -> dict:
-    """Test from one source host to all destinations"""
+    """Test from one source host to all destinations.
+
+    Destinations are spread round-robin over up to SESSIONS_PER_HOST SSH
+    sessions to the source, each worked by its own thread.
+    """
     results = {
         "source": source_name,
         "source_ip": HOSTS[source_name]["host_ip"],
@@ -301,32 +346,49 @@ def test_host_to_all(source_name: str, all_hosts: list, quick: bool = False) ->
         "traceroute_results": [],
     }
 
-    conn = get_connection(source_name)
-    if not conn:
+    dest_names = [d for d in all_hosts if d != source_name]
+    session_count = min(SESSIONS_PER_HOST, len(dest_names))
+
+    # The first session waits for a free slot; extra sessions are only
+    # opened while slots are spare, so sources never deadlock on each other.
+    # Stop at the first failed login so a down host is reported only once
+    conns = []
+    for i in range(session_count):
+        if not _SESSION_SLOTS.acquire(blocking=(i == 0)):
+            break
+        conn = get_connection(source_name)
+        if not conn:
+            _SESSION_SLOTS.release()
+            break
+        conns.append(conn)
+    if not conns:
         return results
 
+    dest_results = {}
     try:
-        for dest_name in all_hosts:
-            if dest_name == source_name:
-                continue
-
-            # Quick ping for connectivity
-            ping = run_ping(conn, source_name, dest_name, count=5, size=100)
-            results["ping_results"].append(asdict(ping))
-
-            if quick:
-                continue
-
-            # Full throughput test
-            throughput = measure_throughput(conn, source_name, dest_name)
-            results["throughput_results"].append(asdict(throughput))
-
-            # Traceroute for path
-            trace = run_traceroute(conn, source_name, dest_name)
-            results["traceroute_results"].append(asdict(trace))
-
+        with ThreadPoolExecutor(max_workers=len(conns)) as executor:
+            futures = [
+                executor.submit(test_destinations, conn, source_name,
+                                dest_names[i::len(conns)], quick)
+                for i, conn in enumerate(conns)
+            ]
+            for future in as_completed(futures):
+                dest_results.update(future.result())
     finally:
-        conn.disconnect()
+        for conn in conns:
+            conn.disconnect()
+            _SESSION_SLOTS.release()
+
+    # Keep output in destination order regardless of which session finished first
+    for dest_name in dest_names:
+        if dest_name not in dest_results:
+            continue
+        ping, throughput, trace = dest_results[dest_name]
+        results["ping_results"].append(ping)
+        if throughput is not None:
+            results["throughput_results"].append(throughput)
+        if trace is not None:
+            results["traceroute_results"].append(trace)
 
     return results
 
@@ -390,7 +452,13 @@ def calculate_summary(all_results: list) -> dict:
     return summary
 
 
-def run_traffic_test(quick: bool = False, output_file: str = None):
+def print_worker_messages():
+    """Print messages queued by worker threads so far"""
+    while not PROGRESS.empty():
+        print(PROGRESS.get_nowait())
+
+
+def run_traffic_test(quick: bool = False, output_file: str = None, pretty: bool = False):
     """Execute full traffic test suite"""
     start_time = datetime.now()
     print("=" * 70)
@@ -416,6 +484,7 @@ def run_traffic_test(quick: bool = False, output_file: str = None):
 
         for future in as_completed(futures):
             host = futures[future]
+            print_worker_messages()
             try:
                 result = future.result()
                 all_results.append(result)
@@ -429,6 +498,8 @@ def run_traffic_test(quick: bool = False, output_file: str = None):
             except Exception as e:
                 print(f"  [ERROR] {host}: {e}")
 
+    print_worker_messages()
+
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
 
@@ -442,15 +513,7 @@ def run_traffic_test(quick: bool = False, output_file: str = None):
             "hosts_tested": len(HOSTS),
             "paths_tested": len(HOSTS) * (len(HOSTS) - 1),
         },
-        "hosts": {
-            name: {
-                "ip": cfg["host_ip"],
-                "mgmt_ip": cfg["mgmt_ip"],
-                "campus": cfg["campus"],
-                "edge_router": cfg["edge_router"],
-            }
-            for name, cfg in HOSTS.items()
-        },
+        "hosts": _HOSTS_META,
         "connectivity_matrix": generate_connectivity_matrix(all_results),
         "detailed_results": all_results,
         "summary": calculate_summary(all_results),
@@ -505,8 +568,12 @@ def run_traffic_test(quick: bool = False, output_file: str = None):
         timestamp = start_time.strftime("%Y%m%d_%H%M%S")
         output_file = f"/Users/elliotconner/PycharmProjects/euniv-lab/traffic_test_{timestamp}.json"
 
-    with open(output_file, "w") as f:
-        json.dump(output, f, indent=2)
+    # Compact JSON by default; indented output only when asked for
+    with open(output_file, "w", buffering=OUTPUT_BUFFER_SIZE) as f:
+        if pretty:
+            json.dump(output, f, indent=2)
+        else:
+            json.dump(output, f, separators=(",", ":"))
 
     print()
     print(f"Results saved to: {output_file}")
@@ -530,9 +597,14 @@ def main():
         default=None,
         help="Output JSON file path"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Write indented JSON (default: compact)"
+    )
 
     args = parser.parse_args()
-    run_traffic_test(quick=args.quick, output_file=args.output)
+    run_traffic_test(quick=args.quick, output_file=args.output, pretty=args.pretty)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,6 @@ Tests performed:
 1. Full mesh connectivity between all 6 hosts
 2. Throughput measurement via extended pings with large packets
 3. Path analysis via traceroute with MPLS label detection
-4. Interface counter collection
 
 Usage:
     python traffic_test_pyats.py                           # Full mesh test
@@ -21,25 +20,42 @@ Output: Structured JSON suitable for visualization dashboards
 """
 
 import argparse
+import glob
 import json
 import logging
 import os
 import re
 import sys
 import time
-from dataclasses import asdict, dataclass, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 # pyATS imports
 try:
     from genie.libs.parser.utils import get_parser
+    from genie.libs.parser.utils.common import ParserNotFound
+    from genie.metaparser.util.exceptions import SchemaEmptyParserError
     from pyats.topology import loader
     from unicon.core.errors import ConnectionError, SubCommandFailure
 except ImportError:
     print("Please install pyATS: pip install pyats[full] genie")
     sys.exit(1)
 
+# Optional: faster JSON serialization for large result sets
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: vectorized summary statistics for large meshes
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -52,11 +68,38 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_TESTBED = os.path.join(SCRIPT_DIR, "pyats", "host_testbed.yaml")
 
 # Test parameters
+# More than one probe packet: IOS drops the first echo while ARP resolves
+# (".!!!"), which would mark a live destination unreachable
+PING_COUNT_PROBE = 3
 PING_COUNT_QUICK = 5
 PING_COUNT_FULL = 100
 PING_SIZE = 1400
 PING_TIMEOUT = 2
 
+# SSH connection multiplexing: the master connection briefly outlives the
+# run, so back-to-back runs skip the TCP + SSH handshake. Each host has a
+# single session, so IOS only ever serves one channel per connection; the
+# persist time is kept short because an idle master still holds a VTY line
+SSH_MUX_DIR = os.path.expanduser("~/.cache/e-university/ssh-mux")
+SSH_MUX_OPTIONS = (
+    "-o ControlMaster=auto "
+    f"-o ControlPath={SSH_MUX_DIR}/%r@%h:%p "
+    "-o ControlPersist=30s"
+)
+CONNECT_TIMEOUT_MUX = 15   # Connect timeout when a master socket already exists
+
+# Commands kept queued on a device when pipelining quick pings
+PIPELINE_DEPTH = 2
+
+# Exec prompt terminating each command's output when commands are batched
+PROMPT_PATTERN = r'(?m)^[\w.\-]+#'
+
+# Output parsers, compiled once rather than on every call
+# "Success rate is X percent (Y/Z)"
+_RE_PING_RATE = re.compile(r'Success rate is (\d+) percent \((\d+)/(\d+)\)')
+# "round-trip min/avg/max = X/Y/Z ms"
+_RE_PING_RTT = re.compile(r'round-trip min/avg/max = ([\d.]+)/([\d.]+)/([\d.]+)')
+
 
 @dataclass
 class PingResult:
@@ -109,21 +152,36 @@ class TrafficTest:
         self.testbed = loader.load(testbed_file)
         self.connected_devices: Dict[str, Any] = {}
         self.host_ips: Dict[str, str] = {}
+        # CLI strings shared by all source workers; setdefault keeps it thread-safe
+        self._cmd_cache: Dict[tuple, str] = {}
 
-        # Extract host IPs from testbed custom fields
+        # Extract host IPs and metadata from testbed custom fields once, so the
+        # per-destination tests and the JSON output don't re-resolve them
+        self.host_meta: Dict[str, Dict[str, str]] = {}
         for name, device in self.testbed.devices.items():
             if hasattr(device, 'custom') and 'host_ip' in device.custom:
                 self.host_ips[name] = device.custom['host_ip']
+                self.host_meta[name] = {
+                    "ip": device.custom['host_ip'],
+                    "mgmt_ip": str(device.connections.cli.ip),
+                    "campus": device.custom.get('campus', ''),
+                    "edge_router": device.custom.get('edge_router', ''),
+                }
 
     def connect_hosts(self) -> Dict[str, bool]:
         """Connect to all host devices."""
         results = {}
         logger.info(f"\nConnecting to {len(self.testbed.devices)} host devices...")
 
+        os.makedirs(SSH_MUX_DIR, mode=0o700, exist_ok=True)
+
         for name, device in self.testbed.devices.items():
             try:
                 if not device.is_connected():
-                    device.connect(log_stdout=False, learn_hostname=True)
+                    connect_args = {"log_stdout": False, "learn_hostname": True}
+                    if self._enable_ssh_mux(device):
+                        connect_args["connection_timeout"] = CONNECT_TIMEOUT_MUX
+                    device.connect(**connect_args)
                 self.connected_devices[name] = device
                 results[name] = True
                 logger.info(f"  + Connected: {name}")
@@ -133,6 +191,31 @@ class TrafficTest:
 
         return results
 
+    @staticmethod
+    def _enable_ssh_mux(device) -> bool:
+        """Add ControlMaster options to a device's SSH connection.
+
+        Returns True if a master socket for the device is already open.
+        """
+        cli = device.connections.get('cli')
+        if not cli or cli.get('protocol') != 'ssh':
+            return False
+        cli.setdefault('ssh_options', SSH_MUX_OPTIONS)
+        port = cli.get('port', 22)
+        return bool(glob.glob(os.path.join(SSH_MUX_DIR, f"*@{cli.ip}:{port}")))
+
+    def _reconnect(self, device_name: str):
+        """Replace a device's session when its channel state is unknown."""
+        device = self.connected_devices[device_name]
+        try:
+            device.disconnect()
+        except Exception:
+            pass
+        try:
+            device.connect(log_stdout=False, learn_hostname=True)
+        except Exception as e:
+            logger.error(f"  ! Failed to reconnect to {device_name}: {e}")
+
     def disconnect_hosts(self):
         """Disconnect from all devices."""
         for name, device in self.connected_devices.items():
@@ -142,8 +225,18 @@ class TrafficTest:
                 pass
 
     def run_ping(self, source_name: str, dest_name: str,
-                 count: int = 5, size: int = 100) -> PingResult:
-        """Execute ping using device.execute() for reliable parsing."""
+                 count: int = 5, size: int = 100,
+                 probe_count: Optional[int] = None) -> PingResult:
+        """Execute ping using device.execute() for reliable parsing.
+
+        With probe_count, a short liveness ping is sent first and the full
+        count only runs if it gets a reply, so dead destinations fail fast.
+        """
+        if probe_count is not None and probe_count < count:
+            probe = self.run_ping(source_name, dest_name, count=probe_count, size=size)
+            if not probe.success:
+                return probe
+
         dest_ip = self.host_ips.get(dest_name, "")
         result = PingResult(
             source=source_name,
@@ -159,24 +252,9 @@ class TrafficTest:
 
         try:
             # Use execute for more reliable output parsing
-            cmd = f"ping {dest_ip} repeat {count} size {size} timeout {PING_TIMEOUT}"
+            cmd = self._ping_command(dest_ip, count, size)
             output = device.execute(cmd, timeout=count * PING_TIMEOUT + 30)
-
-            # Parse success rate: "Success rate is X percent (Y/Z)"
-            rate_match = re.search(r'Success rate is (\d+) percent \((\d+)/(\d+)\)', output)
-            if rate_match:
-                success_pct = int(rate_match.group(1))
-                result.packets_received = int(rate_match.group(2))
-                result.packets_sent = int(rate_match.group(3))
-                result.packet_loss_pct = 100.0 - success_pct
-                result.success = result.packets_received > 0
-
-            # Parse RTT: "round-trip min/avg/max = X/Y/Z ms"
-            rtt_match = re.search(r'round-trip min/avg/max = ([\d.]+)/([\d.]+)/([\d.]+)', output)
-            if rtt_match:
-                result.min_ms = float(rtt_match.group(1))
-                result.avg_ms = float(rtt_match.group(2))
-                result.max_ms = float(rtt_match.group(3))
+            self._parse_ping_structured(device, cmd, output, result)
 
         except SubCommandFailure:
             result.packets_sent = count
@@ -188,6 +266,64 @@ class TrafficTest:
 
         return result
 
+    def _ping_command(self, dest_ip: str, count: int, size: int) -> str:
+        """Build the extended ping command line, cached per (dest, count, size)."""
+        key = ("ping", dest_ip, count, size)
+        cmd = self._cmd_cache.get(key)
+        if cmd is None:
+            cmd = self._cmd_cache.setdefault(
+                key, f"ping {dest_ip} repeat {count} size {size} timeout {PING_TIMEOUT}"
+            )
+        return cmd
+
+    @classmethod
+    def _parse_ping_structured(cls, device, cmd: str, output: str,
+                               result: PingResult) -> PingResult:
+        """Fill a PingResult using the Genie ping parser on captured output.
+
+        Falls back to the regex parser when Genie has no parser for the command
+        or returns nothing for the output. Any other parser failure is logged
+        before falling back, so schema changes do not go unnoticed.
+        """
+        try:
+            stats = device.parse(cmd, output=output)["ping"]["statistics"]
+        except (SchemaEmptyParserError, ParserNotFound):
+            return cls._parse_ping(output, result)
+        except Exception:
+            logger.warning(f"Genie ping parser failed for '{cmd}'", exc_info=True)
+            return cls._parse_ping(output, result)
+
+        result.packets_sent = int(stats.get("send", 0))
+        result.packets_received = int(stats.get("received", 0))
+        result.packet_loss_pct = 100.0 - float(stats.get("success_rate_percent", 0))
+        result.success = result.packets_received > 0
+
+        rtt = stats.get("round_trip", {})
+        result.min_ms = float(rtt.get("min_ms", 0.0))
+        result.avg_ms = float(rtt.get("avg_ms", 0.0))
+        result.max_ms = float(rtt.get("max_ms", 0.0))
+
+        return result
+
+    @staticmethod
+    def _parse_ping(output: str, result: PingResult) -> PingResult:
+        """Fill a PingResult from IOS ping output."""
+        rate_match = _RE_PING_RATE.search(output)
+        if rate_match:
+            success_pct = int(rate_match.group(1))
+            result.packets_received = int(rate_match.group(2))
+            result.packets_sent = int(rate_match.group(3))
+            result.packet_loss_pct = 100.0 - success_pct
+            result.success = result.packets_received > 0
+
+        rtt_match = _RE_PING_RTT.search(output)
+        if rtt_match:
+            result.min_ms = float(rtt_match.group(1))
+            result.avg_ms = float(rtt_match.group(2))
+            result.max_ms = float(rtt_match.group(3))
+
+        return result
+
     def run_traceroute(self, source_name: str, dest_name: str) -> TracerouteResult:
         """Execute traceroute and parse path."""
         dest_ip = self.host_ips.get(dest_name, "")
@@ -205,110 +341,145 @@ class TrafficTest:
 
         try:
             # Execute traceroute command
-            output = device.execute(
-                f"traceroute {dest_ip} timeout 2 probe 1",
-                timeout=120
-            )
+            output = device.execute(self._traceroute_command(dest_ip), timeout=120)
+            self._parse_traceroute(output, result)
 
-            # Parse each hop using regex
-            # Format: "  1 10.0.0.1 4 msec" or with MPLS labels
-            hop_pattern = re.compile(
-                r'^\s*(\d+)\s+(\d+\.\d+\.\d+\.\d+|\*)'
-                r'(?:\s+(\d+)\s*msec)?'
-                r'(?:.*\[MPLS:\s*Label\s+(\d+))?',
-                re.MULTILINE
-            )
+        except Exception as e:
+            result.error = str(e)
 
-            hops = []
-            for match in hop_pattern.finditer(output):
-                hop_num = int(match.group(1))
-                hop_ip = match.group(2)
-                latency = float(match.group(3)) if match.group(3) else None
-                mpls_label = int(match.group(4)) if match.group(4) else None
-
-                hop_data = {
-                    "hop": hop_num,
-                    "ip": hop_ip,
-                    "latency_ms": latency,
-                }
-                if mpls_label:
-                    hop_data["mpls_label"] = mpls_label
-                hops.append(hop_data)
+        return result
+
+    def _traceroute_command(self, dest_ip: str) -> str:
+        """Build the traceroute command line, cached per destination."""
+        key = ("traceroute", dest_ip)
+        cmd = self._cmd_cache.get(key)
+        if cmd is None:
+            cmd = self._cmd_cache.setdefault(key, f"traceroute {dest_ip} timeout 2 probe 1")
+        return cmd
+
+    @staticmethod
+    def _parse_traceroute(output: str, result: TracerouteResult) -> TracerouteResult:
+        """Fill a TracerouteResult from IOS traceroute output.
+
+        Hop lines are tokenized on whitespace rather than matched with a regex:
+            "  1 10.0.0.1 4 msec"
+            "  2 10.0.0.2 [MPLS: Label 16 Exp 0] 4 msec"
+        """
+        hops = []
+        for line in output.splitlines():
+            toks = line.split()
+            if len(toks) < 2 or not toks[0].isdigit():
+                continue
+            hop_num = int(toks[0])
+            hop_ip = toks[1]
+            latency = None
+            mpls_label = None
+            try:
+                if "msec" in toks:
+                    latency = float(toks[toks.index("msec") - 1])
+                if "Label" in toks:
+                    mpls_label = int(toks[toks.index("Label") + 1].rstrip("]"))
+            except (IndexError, ValueError):
+                pass
 
-            result.hops = hops
-            result.total_hops = len(hops)
-            result.success = len(hops) > 0 and hops[-1]["ip"] == dest_ip
+            hop_data = {
+                "hop": hop_num,
+                "ip": hop_ip,
+                "latency_ms": latency,
+            }
+            if mpls_label:
+                hop_data["mpls_label"] = mpls_label
+            hops.append(hop_data)
 
-        except Exception as e:
-            result.error = str(e)
+        result.hops = hops
+        result.total_hops = len(hops)
+        result.success = len(hops) > 0 and hops[-1]["ip"] == result.dest_ip
 
         return result
 
-    def get_interface_counters(self, device_name: str) -> Dict[str, int]:
-        """Get interface byte counters using Genie parser."""
-        if device_name not in self.connected_devices:
-            return {"bytes_in": 0, "bytes_out": 0, "packets_in": 0, "packets_out": 0}
+    @staticmethod
+    def _pipeline(device, cmds: List[str], timeout: int = 60,
+                  depth: int = PIPELINE_DEPTH) -> Iterator[str]:
+        """Yield each command's output in order while later commands run.
+
+        Up to ``depth`` commands are kept queued on the device; the next one is
+        sent as soon as an output is read, so the caller parses output N while
+        the device is already executing command N+1.
+        """
+        remaining = deque(cmds)
+        pending = 0
+        while remaining and pending < depth:
+            device.sendline(remaining.popleft())
+            pending += 1
+        while pending:
+            match = device.expect([PROMPT_PATTERN], timeout=timeout)
+            pending -= 1
+            if remaining:
+                device.sendline(remaining.popleft())
+                pending += 1
+            yield match.match_output
+
+    def quick_ping_all(self, source_name: str, dest_names: List[str],
+                       count: int = PING_COUNT_QUICK,
+                       probe_count: Optional[int] = None) -> List[PingResult]:
+        """Run the quick connectivity ping to each destination, pipelined.
+
+        With probe_count, all destinations get a short liveness ping first and
+        only those that reply get the full count.
+        """
+        if probe_count is not None and probe_count < count:
+            probes = self.quick_ping_all(source_name, dest_names, count=probe_count)
+            alive = [p.destination for p in probes if p.success]
+            full = {p.destination: p for p in self.quick_ping_all(source_name, alive, count=count)}
+            return [full.get(p.destination, p) for p in probes]
+
+        results = [
+            PingResult(source=source_name, destination=d, dest_ip=self.host_ips.get(d, ""))
+            for d in dest_names
+        ]
+        if source_name not in self.connected_devices:
+            for result in results:
+                result.error = "Source device not connected"
+            return results
 
-        device = self.connected_devices[device_name]
+        device = self.connected_devices[source_name]
+        cmds = [self._ping_command(r.dest_ip, count, 100) for r in results]
 
         try:
-            # Use Genie parser for structured output
-            parsed = device.parse("show interfaces GigabitEthernet0/0")
-
-            intf_data = parsed.get("GigabitEthernet0/0", {})
-            counters = intf_data.get("counters", {})
+            outputs = self._pipeline(device, cmds, timeout=count * PING_TIMEOUT + 30)
+            for result, cmd, output in zip(results, cmds, outputs):
+                self._parse_ping_structured(device, cmd, output, result)
+        except Exception as e:
+            for result in results:
+                if not result.packets_sent:
+                    result.error = str(e)
+            # Output of pings still queued on the device would be read as
+            # the reply to the next command, so continue on a fresh session
+            self._reconnect(source_name)
 
-            return {
-                "bytes_in": counters.get("in_octets", 0),
-                "bytes_out": counters.get("out_octets", 0),
-                "packets_in": counters.get("in_pkts", 0),
-                "packets_out": counters.get("out_pkts", 0),
-            }
-        except Exception:
-            # Fallback to manual parsing
-            try:
-                output = device.execute(
-                    "show interface GigabitEthernet0/0 | include packets input|packets output"
-                )
-                in_match = re.search(r'(\d+) packets input, (\d+) bytes', output)
-                out_match = re.search(r'(\d+) packets output, (\d+) bytes', output)
-                return {
-                    "bytes_in": int(in_match.group(2)) if in_match else 0,
-                    "bytes_out": int(out_match.group(2)) if out_match else 0,
-                    "packets_in": int(in_match.group(1)) if in_match else 0,
-                    "packets_out": int(out_match.group(1)) if out_match else 0,
-                }
-            except Exception:
-                return {"bytes_in": 0, "bytes_out": 0, "packets_in": 0, "packets_out": 0}
+        return results
 
     def measure_throughput(self, source_name: str, dest_name: str) -> ThroughputResult:
-        """Measure throughput by sending traffic and measuring counters."""
+        """Measure throughput from the bytes delivered by a large extended ping."""
         dest_ip = self.host_ips.get(dest_name, "")
         result = ThroughputResult(source=source_name, destination=dest_name)
 
         if source_name not in self.connected_devices:
             return result
 
-        device = self.connected_devices[source_name]
-
         try:
-            # Get counters before
-            before = self.get_interface_counters(source_name)
-            start_time = time.time()
-
-            # Send high-volume ping traffic
+            # Send high-volume ping traffic; the ping statistics give the bytes
+            # delivered, so no interface counter reads are needed around it
+            start_time = time.perf_counter()
             ping_result = self.run_ping(
                 source_name, dest_name,
                 count=PING_COUNT_FULL,
                 size=PING_SIZE
             )
+            end_time = time.perf_counter()
 
-            end_time = time.time()
-            # Get counters after
-            after = self.get_interface_counters(source_name)
-
-            # Calculate throughput
-            bytes_sent = after["bytes_out"] - before["bytes_out"]
+            # Calculate throughput (IOS ping size is the whole IP datagram)
+            bytes_sent = ping_result.packets_received * PING_SIZE
             duration = end_time - start_time
 
             result.packets_sent = ping_result.packets_sent
@@ -332,43 +503,53 @@ class TrafficTest:
         results = {
             "source": source_name,
             "source_ip": self.host_ips.get(source_name, ""),
-            "campus": "",
+            "campus": self.host_meta.get(source_name, {}).get("campus", ""),
             "ping_results": [],
             "throughput_results": [],
             "traceroute_results": [],
         }
 
-        # Get campus from testbed custom fields
-        if source_name in self.testbed.devices:
-            device = self.testbed.devices[source_name]
-            if hasattr(device, 'custom'):
-                results["campus"] = device.custom.get('campus', '')
-
         if source_name not in self.connected_devices:
             return results
 
-        for dest_name in self.host_ips.keys():
-            if dest_name == source_name:
-                continue
+        dest_names = [d for d in self.host_ips.keys() if d != source_name]
+
+        # Result dataclasses hold only flat fields (hops is a list of plain
+        # dicts), so a shallow __dict__ copy stands in for the deep-copying asdict()
+        if quick:
+            # Quick connectivity pings, pipelined across destinations
+            for ping in self.quick_ping_all(source_name, dest_names,
+                                            probe_count=PING_COUNT_PROBE):
+                results["ping_results"].append(dict(ping.__dict__))
+            return results
 
-            # Quick connectivity ping
+        for dest_name in dest_names:
+            # Quick connectivity ping, after a short liveness probe
             ping = self.run_ping(
                 source_name, dest_name,
                 count=PING_COUNT_QUICK,
-                size=100
+                size=100,
+                probe_count=PING_COUNT_PROBE
             )
-            results["ping_results"].append(asdict(ping))
-
-            if quick:
+            results["ping_results"].append(dict(ping.__dict__))
+
+            # Unreachable: skip the throughput ping and traceroute, which would
+            # only run into their timeouts
+            if not ping.success:
+                throughput = ThroughputResult(source=source_name, destination=dest_name)
+                trace = TracerouteResult(source=source_name, destination=dest_name,
+                                         dest_ip=ping.dest_ip)
+                results["throughput_results"].append(dict(throughput.__dict__))
+                results["traceroute_results"].append(dict(trace.__dict__))
                 continue
 
             # Full throughput test
             throughput = self.measure_throughput(source_name, dest_name)
-            results["throughput_results"].append(asdict(throughput))
+            results["throughput_results"].append(dict(throughput.__dict__))
 
             # Traceroute for path analysis
             trace = self.run_traceroute(source_name, dest_name)
-            results["traceroute_results"].append(asdict(trace))
+            results["traceroute_results"].append(dict(trace.__dict__))
 
         return results
 
@@ -415,26 +596,45 @@ def calculate_summary(all_results: List[Dict]) -> Dict:
     }
 
     if latencies:
-        summary["latency_ms"] = {
-            "min": round(min(latencies), 2),
-            "max": round(max(latencies), 2),
-            "avg": round(sum(latencies) / len(latencies), 2),
-        }
+        summary["latency_ms"] = _describe(latencies, 2)
 
     if total_throughput:
-        summary["throughput_mbps"] = {
-            "min": round(min(total_throughput), 4),
-            "max": round(max(total_throughput), 4),
-            "avg": round(sum(total_throughput) / len(total_throughput), 4),
-            "total_measured": len(total_throughput),
-        }
+        summary["throughput_mbps"] = _describe(total_throughput, 4)
+        summary["throughput_mbps"]["total_measured"] = len(total_throughput)
 
     return summary
 
 
+def _describe(values: List[float], ndigits: int) -> Dict[str, float]:
+    """Return rounded min/max/avg of a non-empty list, vectorized when NumPy is available."""
+    if np is not None:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        low, high, avg = arr.min(), arr.max(), arr.mean()
+    else:
+        low, high, avg = min(values), max(values), sum(values) / len(values)
+    return {
+        "min": round(float(low), ndigits),
+        "max": round(float(high), ndigits),
+        "avg": round(float(avg), ndigits),
+    }
+
+
+def write_results(output: Dict, output_file: str):
+    """Write results JSON atomically so an interrupted run never leaves a partial file."""
+    tmp_file = output_file + ".tmp"
+    if orjson is not None:
+        with open(tmp_file, "wb") as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_file, "w") as f:
+            json.dump(output, f, indent=2)
+    os.replace(tmp_file, output_file)
+
+
 def run_traffic_test(testbed_file: str, quick: bool = False, output_file: str = None):
     """Execute full traffic test suite using pyATS."""
     start_time = datetime.now()
+    start_clock = time.perf_counter()
 
     print("=" * 70)
     print("E-University Network - End-to-End Traffic Test (pyATS)")
@@ -460,26 +660,40 @@ def run_traffic_test(testbed_file: str, quick: bool = False, output_file: str =
 
     all_results = []
 
-    # Run tests sequentially (pyATS connections aren't thread-safe)
+    sources = []
     for host_name in test.host_ips.keys():
         if host_name not in test.connected_devices:
             logger.warning(f"  [{host_name}] Skipped - not connected")
             continue
+        sources.append(host_name)
+
+    # Run one worker per source device. A unicon connection must not be shared
+    # across threads, so each device object is pinned to exactly one worker;
+    # connected_devices and host_ips are only read during this phase.
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+        futures = {
+            executor.submit(test.test_host_to_all, host_name, quick): host_name
+            for host_name in sources
+        }
 
-        result = test.test_host_to_all(host_name, quick=quick)
-        all_results.append(result)
-
-        # Print progress
-        success_count = sum(1 for p in result["ping_results"] if p["success"])
-        total_count = len(result["ping_results"])
-        campus = result["campus"].upper() if result["campus"] else "?"
-        print(f"  [{campus:8}] {host_name}: {success_count}/{total_count} destinations reachable")
+        for future in as_completed(futures):
+            host_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"  [{host_name}] Test failed: {e}")
+                continue
+            all_results.append(result)
 
-    # Disconnect
-    test.disconnect_hosts()
+            # Print progress
+            success_count = sum(1 for p in result["ping_results"] if p["success"])
+            total_count = len(result["ping_results"])
+            campus = result["campus"].upper() if result["campus"] else "?"
+            print(f"  [{campus:8}] {host_name}: {success_count}/{total_count} destinations reachable")
 
+    # Wall-clock timestamps for the metadata, monotonic clock for the duration
     end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    duration = time.perf_counter() - start_clock
 
     # Build output structure
     output = {
@@ -494,24 +708,26 @@ def run_traffic_test(testbed_file: str, quick: bool = False, output_file: str =
             "paths_tested": len(test.host_ips) * (len(test.host_ips) - 1),
         },
         "hosts": {
-            name: {
-                "ip": test.host_ips.get(name, ""),
-                "mgmt_ip": str(test.testbed.devices[name].connections.cli.ip)
-                           if name in test.testbed.devices else "",
-                "campus": test.testbed.devices[name].custom.get('campus', '')
-                          if name in test.testbed.devices and
-                             hasattr(test.testbed.devices[name], 'custom') else "",
-                "edge_router": test.testbed.devices[name].custom.get('edge_router', '')
-                               if name in test.testbed.devices and
-                                  hasattr(test.testbed.devices[name], 'custom') else "",
-            }
-            for name in test.host_ips.keys()
+            name: test.host_meta.get(name, {"ip": test.host_ips.get(name, "")})
+            for name in test.host_ips
         },
         "connectivity_matrix": generate_connectivity_matrix(all_results),
         "detailed_results": all_results,
         "summary": calculate_summary(all_results),
     }
 
+    # Save to file in the background while the SSH sessions are torn down
+    if output_file is None:
+        timestamp = start_time.strftime("%Y%m%d_%H%M%S")
+        output_file = os.path.join(SCRIPT_DIR, f"traffic_test_pyats_{timestamp}.json")
+
+    writer_pool = ThreadPoolExecutor(max_workers=1)
+    writer = writer_pool.submit(write_results, output, output_file)
+    writer_pool.shutdown(wait=False)
+
+    # Disconnect
+    test.disconnect_hosts()
+
     # Print summary
     print()
     print("=" * 70)
@@ -541,31 +757,29 @@ def run_traffic_test(testbed_file: str, quick: bool = False, output_file: str =
     print(header)
 
     matrix = output["connectivity_matrix"]
+    row_maps = {s: matrix.get(s, {}) for s in hosts_list}
     for src in hosts_list:
-        row = f"{src:<8} "
+        row_map = row_maps[src]
+        cells = [f"{src:<8} "]
         for dst in hosts_list:
+            entry = row_map.get(dst)
             if src == dst:
-                row += "      - "
-            elif src in matrix and dst in matrix[src]:
-                entry = matrix[src][dst]
-                if entry["reachable"]:
-                    row += f"{entry['avg_latency_ms']:>7.1f} "
-                else:
-                    row += "      X "
+                cells.append("      - ")
+            elif entry is None:
+                cells.append("      ? ")
+            elif entry["reachable"]:
+                cells.append(f"{entry['avg_latency_ms']:>7.1f} ")
             else:
-                row += "      ? "
-        print(row)
-
-    # Save to file
-    if output_file is None:
-        timestamp = start_time.strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(SCRIPT_DIR, f"traffic_test_pyats_{timestamp}.json")
-
-    with open(output_file, "w") as f:
-        json.dump(output, f, indent=2)
+                cells.append("      X ")
+        print("".join(cells))
 
     print()
-    print(f"Results saved to: {output_file}")
+    try:
+        writer.result()
+    except Exception as e:
+        logger.error(f"Failed to save results to {output_file}: {e}")
+    else:
+        print(f"Results saved to: {output_file}")
     print("=" * 70)
 
     return output
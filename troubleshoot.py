@@ -18,9 +18,14 @@ Author: E-University Network Team
 """
 
 import argparse
+import atexit
 import os
 import re
+import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import yaml
 from dotenv import load_dotenv
@@ -32,6 +37,9 @@ load_dotenv()
 USERNAME = os.getenv("DEVICE_USERNAME", "admin")
 PASSWORD = os.getenv("DEVICE_PASSWORD")
 
+# Per-character typing is only wanted when recording
+DEMO_TYPING = os.getenv("DEMO_TYPING") == "1"
+
 # Path to testbed file (relative to script location)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TESTBED_FILE = os.path.join(SCRIPT_DIR, "testbed.yaml")
@@ -64,6 +72,14 @@ def load_devices_from_testbed():
 
 DEVICES = load_devices_from_testbed()
 
+# '| count' output, matching only when at least one line matched
+_COUNT_RE = re.compile(r'regexp = ([1-9]\d*)')
+_SUCCESS_RE = re.compile(r'Success rate is (\d+) percent')
+
+# Live output is streamed; only this many trailing lines are kept for analysis
+STREAM_TAIL_LINES = 256
+STREAM_TIMEOUT = 30
+
 # Colors
 RED = "\033[91m"
 GREEN = "\033[92m"
@@ -74,10 +90,14 @@ BOLD = "\033[1m"
 RESET = "\033[0m"
 
 
-def connect(name):
-    """Connect to device"""
-    if name not in DEVICES:
-        return None
+# Open sessions keyed by device name, reused across demos and checks
+_POOL = {}
+_POOL_LOCK = threading.Lock()     # guards _POOL and _DIAL_LOCKS only
+_DIAL_LOCKS = {}                  # device name -> lock held while dialling it
+
+
+def _dial(name):
+    """Open a new enabled session to a device"""
     device = {
         "device_type": "cisco_ios",
         "host": DEVICES[name]["ip"],
@@ -94,6 +114,76 @@ def connect(name):
         return None
 
 
+def connect(name):
+    """Connect to device, reusing a pooled session while it is still alive"""
+    if name not in DEVICES:
+        return None
+    with _POOL_LOCK:
+        dial_lock = _DIAL_LOCKS.setdefault(name, threading.Lock())
+
+    # Only callers for the same device wait on each other; handshakes to
+    # different devices run in parallel
+    with dial_lock:
+        with _POOL_LOCK:
+            conn = _POOL.get(name)
+        if conn is not None and conn.is_alive():
+            return conn
+
+        conn = _dial(name)
+        with _POOL_LOCK:
+            if conn is not None:
+                _POOL[name] = conn
+            else:
+                _POOL.pop(name, None)
+        return conn
+
+
+def close_pool():
+    """Disconnect every pooled session"""
+    with _POOL_LOCK:
+        for conn in _POOL.values():
+            try:
+                conn.disconnect()
+            except Exception:
+                pass
+        _POOL.clear()
+
+
+atexit.register(close_pool)
+
+
+_HBAR = "█" * 70
+_RULE = "═" * 66
+
+
+def _banner(lines):
+    """Emit a block of lines with a single write"""
+    sys.stdout.flush()
+    os.write(1, ("\n".join(lines) + "\n").encode())
+
+
+def _title_lines(title):
+    """Lines for a full-width boxed title"""
+    return [
+        "",
+        f"{CYAN}{_HBAR}",
+        f"█{' ' * 68}█",
+        f"█  {title:<65}█",
+        f"█{' ' * 68}█",
+        f"{_HBAR}{RESET}",
+    ]
+
+
+def _phase_lines(color, title):
+    """Lines for a phase heading between two rules"""
+    return [
+        "",
+        f"  {color}{_RULE}{RESET}",
+        f"  {color}  {title}{RESET}",
+        f"  {color}{_RULE}{RESET}",
+    ]
+
+
 def dramatic_pause(seconds=2, message=""):
     """Pause with optional message"""
     if message:
@@ -101,33 +191,127 @@ def dramatic_pause(seconds=2, message=""):
     time.sleep(seconds)
 
 
+def _vpnv4_up(output, neighbors=("10.255.0.1", "10.255.0.2")):
+    """
+    True if every neighbor has an established row in a BGP summary.
+
+    A re-activated neighbor is listed straight away in Idle/Active; only
+    an established session shows a prefix count in the State/PfxRcd column.
+    """
+    established = set()
+    for line in output.splitlines():
+        fields = line.split()
+        if fields and fields[0] in neighbors and fields[-1].isdigit():
+            established.add(fields[0])
+    return established.issuperset(neighbors)
+
+
+def wait_for(conn, cmd, predicate, timeout=8, interval=0.5):
+    """Poll a command until predicate(output) holds or timeout expires; returns True on success"""
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate(conn.send_command(cmd)):
+            return True
+        if time.monotonic() + interval >= deadline:
+            return False
+        time.sleep(interval)
+
+
 def typing_effect(text, delay=0.03):
-    """Print with typing effect"""
+    """Print with typing effect (set DEMO_TYPING=1 to enable)"""
+    if not DEMO_TYPING:
+        print(text)
+        return
     for char in text:
         print(char, end='', flush=True)
         time.sleep(delay)
     print()
 
 
-def run_live_command(conn, command, description):
-    """Run command with live visual feedback"""
+def _ping_working(output, threshold=80):
+    """True if a ping's success rate is at least threshold percent"""
+    match = _SUCCESS_RE.search(output)
+    return bool(match) and int(match.group(1)) >= threshold
+
+
+def _print_command(command, description):
+    """Print the heading shown before a live command"""
     print(f"\n  {YELLOW}▶ {description}{RESET}")
     print(f"  {CYAN}$ {command}{RESET}")
-    dramatic_pause(1)
 
-    output = conn.send_command(command, read_timeout=30)
 
-    # Show abbreviated output
+def _print_output(output):
+    """Show abbreviated command output in a single write"""
     lines = output.strip().split('\n')
     if len(lines) > 10:
-        for line in lines[:8]:
-            print(f"    {line}")
-        print(f"    {CYAN}... ({len(lines) - 8} more lines){RESET}")
+        shown = [f"    {line}" for line in lines[:8]]
+        shown.append(f"    {CYAN}... ({len(lines) - 8} more lines){RESET}")
     else:
+        shown = [f"    {line}" for line in lines]
+    sys.stdout.write("\n".join(shown) + "\n")
+    sys.stdout.flush()
+
+
+def _stream_command(conn, command):
+    """
+    Send a command and print its output as it arrives.
+
+    Shows the same abbreviated view as _print_output: up to 10 lines in
+    full, otherwise the first 8 and a count of the rest. Only the last
+    STREAM_TAIL_LINES lines are kept and returned for analysis.
+    """
+    prompt = re.compile(re.escape(conn.base_prompt) + r"[>#]\s*$")
+    conn.write_channel(command + conn.RETURN)
+
+    tail = deque(maxlen=STREAM_TAIL_LINES)
+    held = []
+    count = 0
+    echo_seen = False
+    pending = ""
+    deadline = time.monotonic() + STREAM_TIMEOUT
+
+    while True:
+        chunk = conn.read_channel()
+        if not chunk:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for prompt after '{command}'")
+            time.sleep(0.05)
+            continue
+
+        pending += chunk
+        *lines, pending = pending.split("\n")
         for line in lines:
+            line = line.rstrip("\r")
+            if not echo_seen:
+                echo_seen = True
+                continue
+            if not count and not line.strip():
+                continue
+            count += 1
+            tail.append(line)
+            if count <= 8:
+                print(f"    {line}", flush=True)
+            elif count <= 10:
+                held.append(line)
+
+        if prompt.search(pending):
+            break
+
+    if count > 10:
+        print(f"    {CYAN}... ({count - 8} more lines){RESET}")
+    else:
+        for line in held:
             print(f"    {line}")
 
-    return output
+    return "\n".join(tail)
+
+
+def run_live_command(conn, command, description):
+    """Run command with live visual feedback"""
+    _print_command(command, description)
+    dramatic_pause(1)
+
+    return _stream_command(conn, command)
 
 
 def demo_break_and_fix_bgp():
@@ -137,13 +321,7 @@ def demo_break_and_fix_bgp():
     Great for showing automated detection and resolution.
     """
 
-    print()
-    print(f"{CYAN}{'█' * 70}")
-    print(f"█{' ' * 68}█")
-    print(f"█  {'LIVE DEMO: BGP VPNv4 FAILURE & RECOVERY':<65}█")
-    print(f"█{' ' * 68}█")
-    print(f"{'█' * 70}{RESET}")
-    print()
+    _banner(_title_lines("LIVE DEMO: BGP VPNv4 FAILURE & RECOVERY") + [""])
 
     # Connect to devices
     print(f"  {BOLD}Connecting to network devices...{RESET}")
@@ -162,10 +340,7 @@ def demo_break_and_fix_bgp():
 
     dramatic_pause(2, "PHASE 1: Verify current working state...")
 
-    print()
-    print(f"  {GREEN}{'═' * 66}{RESET}")
-    print(f"  {GREEN}  PHASE 1: BASELINE - EVERYTHING WORKING{RESET}")
-    print(f"  {GREEN}{'═' * 66}{RESET}")
+    _banner(_phase_lines(GREEN, "PHASE 1: BASELINE - EVERYTHING WORKING"))
 
     # Show VPNv4 is working
     output = run_live_command(pe1, "show ip bgp vpnv4 all summary", "Check VPNv4 sessions")
@@ -174,7 +349,7 @@ def demo_break_and_fix_bgp():
     output = run_live_command(pe1, "ping vrf STAFF-NET 172.20.0.11 source 172.20.0.1 repeat 5",
                               "Test L3VPN connectivity")
 
-    if "!!!!!" in output:
+    if _ping_working(output):
         print(f"\n  {GREEN}✓ STAFF-NET connectivity: WORKING{RESET}")
 
     dramatic_pause(3, "Everything working. Now let's break it...")
@@ -183,10 +358,7 @@ def demo_break_and_fix_bgp():
     # PHASE 2: Break VPNv4
     # ═══════════════════════════════════════════════════════════════════════════
 
-    print()
-    print(f"  {RED}{'═' * 66}{RESET}")
-    print(f"  {RED}  PHASE 2: INJECTING FAILURE{RESET}")
-    print(f"  {RED}{'═' * 66}{RESET}")
+    _banner(_phase_lines(RED, "PHASE 2: INJECTING FAILURE"))
 
     dramatic_pause(2, "Disabling VPNv4 on MAIN-PE1...")
 
@@ -207,46 +379,60 @@ def demo_break_and_fix_bgp():
 
     print(f"\n  {RED}⚠ VPNv4 DISABLED - Network partially broken!{RESET}")
 
-    dramatic_pause(5, "Waiting for BGP to converge...")
+    print(f"\n  {CYAN}⏳ Waiting for BGP to converge...{RESET}")
+    wait_for(pe1, "show ip bgp vpnv4 all summary",
+             lambda o: "10.255.0.1" not in o or "10.255.0.2" not in o, timeout=5)
 
     # ═══════════════════════════════════════════════════════════════════════════
     # PHASE 3: Automated Detection
     # ═══════════════════════════════════════════════════════════════════════════
 
-    print()
-    print(f"  {YELLOW}{'═' * 66}{RESET}")
-    print(f"  {YELLOW}  PHASE 3: AUTOMATED TROUBLESHOOTING{RESET}")
-    print(f"  {YELLOW}{'═' * 66}{RESET}")
+    _banner(_phase_lines(YELLOW, "PHASE 3: AUTOMATED TROUBLESHOOTING"))
 
     dramatic_pause(2, "Running automated diagnostics...")
 
+    # All three diagnostics go out in one batch, then are shown in turn
+    diagnostics = [
+        ("show ip bgp vpnv4 all summary", "Check VPNv4 sessions"),
+        ("ping vrf STAFF-NET 172.20.0.11 source 172.20.0.1 repeat 3 timeout 2", "Test L3VPN connectivity"),
+        ("show ip route vrf STAFF-NET 172.20.0.11", "Check VRF routing table"),
+    ]
+    outputs = _send_batch(pe1, [command for command, _ in diagnostics])
+
     # Check VPNv4 - should be broken now
-    output = run_live_command(pe1, "show ip bgp vpnv4 all summary", "Check VPNv4 sessions")
+    _print_command(*diagnostics[0])
+    _print_output(outputs[0])
 
     print(f"\n  {RED}✗ VPNv4 sessions: NOT ACTIVE{RESET}")
 
     # Try ping - should fail
-    output = run_live_command(pe1, "ping vrf STAFF-NET 172.20.0.11 source 172.20.0.1 repeat 3 timeout 2",
-                              "Test L3VPN connectivity")
+    output = outputs[1]
+    _print_command(*diagnostics[1])
+    _print_output(output)
 
-    if "!" not in output or "Success rate is 0" in output:
+    match = _SUCCESS_RE.search(output)
+    if "!" not in output or (match and match.group(1) == "0"):
         print(f"\n  {RED}✗ STAFF-NET connectivity: FAILED{RESET}")
 
     # Check VRF route
-    output = run_live_command(pe1, "show ip route vrf STAFF-NET 172.20.0.11", "Check VRF routing table")
+    output = outputs[2]
+    _print_command(*diagnostics[2])
+    _print_output(output)
 
     if "not in table" in output.lower() or "172.20.0.11" not in output:
         print(f"\n  {RED}✗ Route to 172.20.0.11: MISSING{RESET}")
 
     # Diagnosis
-    print()
-    print(f"  {RED}╔════════════════════════════════════════════════════════════════╗{RESET}")
-    print(f"  {RED}║  ROOT CAUSE IDENTIFIED                                         ║{RESET}")
-    print(f"  {RED}╠════════════════════════════════════════════════════════════════╣{RESET}")
-    print(f"  {RED}║  • VPNv4 address family not active                             ║{RESET}")
-    print(f"  {RED}║  • No VPNv4 neighbors established                              ║{RESET}")
-    print(f"  {RED}║  • Remote VRF routes not being received                        ║{RESET}")
-    print(f"  {RED}╚════════════════════════════════════════════════════════════════╝{RESET}")
+    _banner([
+        "",
+        f"  {RED}╔════════════════════════════════════════════════════════════════╗{RESET}",
+        f"  {RED}║  ROOT CAUSE IDENTIFIED                                         ║{RESET}",
+        f"  {RED}╠════════════════════════════════════════════════════════════════╣{RESET}",
+        f"  {RED}║  • VPNv4 address family not active                             ║{RESET}",
+        f"  {RED}║  • No VPNv4 neighbors established                              ║{RESET}",
+        f"  {RED}║  • Remote VRF routes not being received                        ║{RESET}",
+        f"  {RED}╚════════════════════════════════════════════════════════════════╝{RESET}",
+    ])
 
     dramatic_pause(3, "Automated fix ready. Applying...")
 
@@ -254,10 +440,7 @@ def demo_break_and_fix_bgp():
     # PHASE 4: Automated Fix
     # ═══════════════════════════════════════════════════════════════════════════
 
-    print()
-    print(f"  {GREEN}{'═' * 66}{RESET}")
-    print(f"  {GREEN}  PHASE 4: AUTOMATED REMEDIATION{RESET}")
-    print(f"  {GREEN}{'═' * 66}{RESET}")
+    _banner(_phase_lines(GREEN, "PHASE 4: AUTOMATED REMEDIATION"))
 
     print(f"\n  {YELLOW}▶ Re-enabling VPNv4 on MAIN-PE1{RESET}")
     print(f"  {CYAN}$ conf t{RESET}")
@@ -278,120 +461,163 @@ def demo_break_and_fix_bgp():
 
     print(f"\n  {GREEN}✓ Configuration applied{RESET}")
 
-    dramatic_pause(8, "Waiting for BGP VPNv4 to reconverge (8 seconds)...")
+    print(f"\n  {CYAN}⏳ Waiting for BGP VPNv4 to reconverge (up to 8 seconds)...{RESET}")
+    wait_for(pe1, "show ip bgp vpnv4 all summary",
+             _vpnv4_up, timeout=8)
 
     # ═══════════════════════════════════════════════════════════════════════════
     # PHASE 5: Verify Fix
     # ═══════════════════════════════════════════════════════════════════════════
 
-    print()
-    print(f"  {GREEN}{'═' * 66}{RESET}")
-    print(f"  {GREEN}  PHASE 5: VERIFICATION{RESET}")
-    print(f"  {GREEN}{'═' * 66}{RESET}")
+    _banner(_phase_lines(GREEN, "PHASE 5: VERIFICATION"))
 
     # Check VPNv4 - should be working now
     output = run_live_command(pe1, "show ip bgp vpnv4 all summary", "Verify VPNv4 sessions")
 
-    if "10.255.0.1" in output and "10.255.0.2" in output:
+    if _vpnv4_up(output):
         print(f"\n  {GREEN}✓ VPNv4 sessions: RE-ESTABLISHED{RESET}")
 
     # Test ping
     output = run_live_command(pe1, "ping vrf STAFF-NET 172.20.0.11 source 172.20.0.1 repeat 5",
                               "Verify L3VPN connectivity")
 
-    if "!!!!!" in output:
+    if _ping_working(output):
         print(f"\n  {GREEN}✓ STAFF-NET connectivity: RESTORED{RESET}")
 
     # Final summary
-    print()
-    print(f"  {GREEN}╔════════════════════════════════════════════════════════════════╗{RESET}")
-    print(f"  {GREEN}║                                                                ║{RESET}")
-    print(f"  {GREEN}║   ✓ ISSUE DETECTED, DIAGNOSED, AND FIXED AUTOMATICALLY       ║{RESET}")
-    print(f"  {GREEN}║                                                                ║{RESET}")
-    print(f"  {GREEN}║   Timeline:                                                    ║{RESET}")
-    print(f"  {GREEN}║     • Failure injected                                         ║{RESET}")
-    print(f"  {GREEN}║     • Automated detection: 5 seconds                           ║{RESET}")
-    print(f"  {GREEN}║     • Root cause analysis: 3 seconds                           ║{RESET}")
-    print(f"  {GREEN}║     • Automated fix applied: 2 seconds                         ║{RESET}")
-    print(f"  {GREEN}║     • Service restored: 8 seconds (BGP convergence)            ║{RESET}")
-    print(f"  {GREEN}║                                                                ║{RESET}")
-    print(f"  {GREEN}║   Total time to resolution: ~18 seconds                        ║{RESET}")
-    print(f"  {GREEN}║                                                                ║{RESET}")
-    print(f"  {GREEN}╚════════════════════════════════════════════════════════════════╝{RESET}")
-
-    pe1.disconnect()
-    core1.disconnect()
+    _banner([
+        "",
+        f"  {GREEN}╔════════════════════════════════════════════════════════════════╗{RESET}",
+        f"  {GREEN}║                                                                ║{RESET}",
+        f"  {GREEN}║   ✓ ISSUE DETECTED, DIAGNOSED, AND FIXED AUTOMATICALLY       ║{RESET}",
+        f"  {GREEN}║                                                                ║{RESET}",
+        f"  {GREEN}║   Timeline:                                                    ║{RESET}",
+        f"  {GREEN}║     • Failure injected                                         ║{RESET}",
+        f"  {GREEN}║     • Automated detection: 5 seconds                           ║{RESET}",
+        f"  {GREEN}║     • Root cause analysis: 3 seconds                           ║{RESET}",
+        f"  {GREEN}║     • Automated fix applied: 2 seconds                         ║{RESET}",
+        f"  {GREEN}║     • Service restored: 8 seconds (BGP convergence)            ║{RESET}",
+        f"  {GREEN}║                                                                ║{RESET}",
+        f"  {GREEN}║   Total time to resolution: ~18 seconds                        ║{RESET}",
+        f"  {GREEN}║                                                                ║{RESET}",
+        f"  {GREEN}╚════════════════════════════════════════════════════════════════╝{RESET}",
+    ])
 
     print()
 
 
+HEALTH_CHECKS = [
+    ("Device Reachability", "MAIN-PE1", "show version | include uptime"),
+    ("OSPF Status", "MAIN-PE1", "show ip ospf neighbor | count FULL"),
+    ("MPLS LDP", "MAIN-PE1", "show mpls ldp neighbor | count Oper"),
+    ("BGP Sessions", "CORE1", "show ip bgp summary | include Estab"),
+    ("VPNv4 Routes", "CORE1", "show ip bgp vpnv4 all | count 172."),
+    ("Internet Path", "MAIN-PE1", "show ip route 0.0.0.0 | include 0.0.0.0"),
+]
+
+# Pass rule per check; a capture group, if any, is reported as the detail
+CHECK_RULES = {
+    "Device Reachability": re.compile(r'uptime', re.IGNORECASE),
+    "OSPF Status": _COUNT_RE,
+    "MPLS LDP": _COUNT_RE,
+    "BGP Sessions": re.compile(r'Estab'),
+    "VPNv4 Routes": _COUNT_RE,
+    "Internet Path": re.compile(r'0\.0\.0\.0'),
+}
+
+
+def _analyze_check(check_name, output):
+    """Classify one check's output, returning (status, detail)"""
+    match = CHECK_RULES[check_name].search(output)
+    if not match:
+        return "warn", ""
+    return "pass", match.group(1) if match.re.groups else ""
+
+
+def _send_batch(conn, commands):
+    """
+    Send several show commands in one write and read them back together.
+
+    The device echoes each command after its prompt, so the combined
+    output is split on the prompt and the echo line dropped from each block.
+    """
+    prompt = re.escape(conn.base_prompt) + r"[>#]"
+    conn.write_channel(conn.RETURN.join(commands) + conn.RETURN)
+    output = conn.read_until_pattern(
+        pattern=rf"(?:.*?{prompt}){{{len(commands)}}}", re_flags=re.S, read_timeout=30
+    )
+    blocks = re.split(prompt, output)[:len(commands)]
+    return ["\n".join(block.splitlines()[1:]) for block in blocks]
+
+
+def _run_device_checks(device, device_checks):
+    """Run all checks for one device in a single batch, returning (status, detail) per check"""
+    conn = connect(device)
+    if not conn:
+        return [("fail", "Cannot connect")] * len(device_checks)
+
+    try:
+        outputs = _send_batch(conn, [command for _, command in device_checks])
+    except Exception as e:
+        return [("fail", str(e))] * len(device_checks)
+    return [
+        _analyze_check(check_name, output)
+        for (check_name, _), output in zip(device_checks, outputs)
+    ]
+
+
 def demo_health_check():
     """
     Run a dramatic network health check for video.
     """
 
-    print()
-    print(f"{CYAN}{'█' * 70}")
-    print(f"█{' ' * 68}█")
-    print(f"█  {'NETWORK HEALTH CHECK':<65}█")
-    print(f"█{' ' * 68}█")
-    print(f"{'█' * 70}{RESET}")
-    print()
+    _banner(_title_lines("NETWORK HEALTH CHECK") + [""])
 
     dramatic_pause(2, "Starting comprehensive health assessment...")
 
-    checks = [
-        ("Device Reachability", "MAIN-PE1", "show version | include uptime"),
-        ("OSPF Status", "MAIN-PE1", "show ip ospf neighbor | count FULL"),
-        ("MPLS LDP", "MAIN-PE1", "show mpls ldp neighbor | count Oper"),
-        ("BGP Sessions", "CORE1", "show ip bgp summary | include Estab"),
-        ("VPNv4 Routes", "CORE1", "show ip bgp vpnv4 all | count 172."),
-        ("Internet Path", "MAIN-PE1", "show ip route 0.0.0.0 | include 0.0.0.0"),
-    ]
-
+    # A pooled session is not safe to share between threads, so run one
+    # worker per device and keep each device's checks on its own session
+    by_device = {}
+    for i, (check_name, device, command) in enumerate(HEALTH_CHECKS):
+        by_device.setdefault(device, []).append((i, check_name, command))
+
+    outcomes = [None] * len(HEALTH_CHECKS)
+    with ThreadPoolExecutor(max_workers=len(by_device)) as executor:
+        futures = {
+            executor.submit(_run_device_checks, device, [(n, c) for _, n, c in items]): items
+            for device, items in by_device.items()
+        }
+        for future in as_completed(futures):
+            for (i, _, _), outcome in zip(futures[future], future.result()):
+                outcomes[i] = outcome
+
+    # Report in the original check order
     results = []
-
-    for check_name, device, command in checks:
+    for (check_name, device, _), (status, detail) in zip(HEALTH_CHECKS, outcomes):
         print(f"\n  {YELLOW}▶ {check_name}{RESET}")
         print(f"    Device: {device}")
 
-        conn = connect(device)
-        if conn:
-            output = conn.send_command(command)
-            conn.disconnect()
-
-            # Analyze result
-            if "uptime" in check_name.lower() and "uptime" in output.lower():
-                results.append(("pass", check_name))
-                print(f"    {GREEN}✓ PASSED{RESET}")
-            elif "FULL" in output or "Oper" in output or "Estab" in output:
-                count = re.search(r'(\d+)', output)
-                results.append(("pass", check_name))
-                print(f"    {GREEN}✓ PASSED{RESET} - {count.group(1) if count else 'OK'}")
-            elif "172." in output or "0.0.0.0" in output:
-                results.append(("pass", check_name))
-                print(f"    {GREEN}✓ PASSED{RESET}")
-            else:
-                results.append(("warn", check_name))
-                print(f"    {YELLOW}⚠ WARNING{RESET}")
+        results.append((status, check_name))
+        if status == "pass":
+            suffix = f" - {detail}" if detail else ""
+            print(f"    {GREEN}✓ PASSED{RESET}{suffix}")
+        elif status == "warn":
+            print(f"    {YELLOW}⚠ WARNING{RESET}")
         else:
-            results.append(("fail", check_name))
-            print(f"    {RED}✗ FAILED - Cannot connect{RESET}")
-
-        time.sleep(1)
+            print(f"    {RED}✗ FAILED - {detail}{RESET}")
 
     # Summary
     passed = sum(1 for r, _ in results if r == "pass")
     total = len(results)
 
     print()
-    print(f"  {'═' * 66}")
+    print(f"  {_RULE}")
     if passed == total:
         print(f"  {GREEN}  ✓ ALL CHECKS PASSED ({passed}/{total}){RESET}")
         print(f"  {GREEN}  Network is healthy!{RESET}")
     else:
         print(f"  {YELLOW}  ⚠ SOME CHECKS FAILED ({passed}/{total} passed){RESET}")
-    print(f"  {'═' * 66}")
+    print(f"  {_RULE}")
     print()
 
 
@@ -407,12 +633,7 @@ def main():
         demo_health_check()
     else:
         # Interactive menu
-        print()
-        print(f"{CYAN}{'█' * 70}")
-        print(f"█{' ' * 68}█")
-        print(f"█  {'TROUBLESHOOTING DEMO MENU':<65}█")
-        print(f"█{' ' * 68}█")
-        print(f"{'█' * 70}{RESET}")
+        _banner(_title_lines("TROUBLESHOOTING DEMO MENU"))
 
         print(f"""
   {BOLD}Video-Ready Demos:{RESET}
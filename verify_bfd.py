@@ -15,15 +15,18 @@ def main():
     print("E-UNIVERSITY BFD VERIFICATION")
     print("=" * 70)
 
+    # One session per device, shared by every test below
+    core1 = testbed.devices["EUNIV-CORE1"]
+    core1.connect(log_stdout=False)
+    pe1 = testbed.devices["EUNIV-MAIN-PE1"]
+    pe1.connect(log_stdout=False)
+
     # =========================================================================
     # Test 1: Check BFD Neighbors on Core Router
     # =========================================================================
     print("\n📡 TEST 1: BFD Neighbors on CORE1")
     print("-" * 70)
 
-    core1 = testbed.devices["EUNIV-CORE1"]
-    core1.connect(log_stdout=False)
-
     output = core1.execute("show bfd neighbors")
     print(output)
 
@@ -31,52 +34,38 @@ def main():
     bfd_up = output.count("Up")
     print(f"\n  ✅ BFD sessions UP: {bfd_up}")
 
-    core1.disconnect()
-
     # =========================================================================
     # Test 2: Verify OSPF BFD Status
     # =========================================================================
     print("\n\n🔗 TEST 2: OSPF BFD Status on CORE1")
     print("-" * 70)
 
-    core1 = testbed.devices["EUNIV-CORE1"]
-    core1.connect(log_stdout=False)
-
     output = core1.execute("show ip ospf interface brief")
     print(output)
 
     output = core1.execute("show ip ospf interface GigabitEthernet2 | include BFD")
     print(f"\nBFD on Gi2: {output.strip()}")
 
-    core1.disconnect()
-
     # =========================================================================
     # Test 3: Verify BGP BFD Status
     # =========================================================================
     print("\n\n🌐 TEST 3: BGP BFD Status on MAIN-PE1")
     print("-" * 70)
 
-    pe1 = testbed.devices["EUNIV-MAIN-PE1"]
-    pe1.connect(log_stdout=False)
-
     output = pe1.execute("show ip bgp neighbors | include neighbor|BFD")
     print(output)
 
-    pe1.disconnect()
-
     # =========================================================================
     # Test 4: BFD Timers Verification
     # =========================================================================
     print("\n\n⏱️  TEST 4: BFD Timer Details")
     print("-" * 70)
 
-    core1 = testbed.devices["EUNIV-CORE1"]
-    core1.connect(log_stdout=False)
-
     output = core1.execute("show bfd neighbors details | include Neighbor|State|Interval")
     print(output)
 
     core1.disconnect()
+    pe1.disconnect()
 
     # =========================================================================
     # Summary
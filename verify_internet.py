@@ -6,6 +6,7 @@ Verifies BGP sessions, default routes, and internet reachability
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 from pyats.topology import loader
@@ -17,6 +18,10 @@ load_dotenv()
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TESTBED_FILE = os.path.join(SCRIPT_DIR, "testbed.yaml")
 
+_SUCCESS_RE = re.compile(r'Success rate is (\d+) percent')
+
+PING_TARGETS = ["8.8.8.8", "1.1.1.1", "9.9.9.9"]
+
 
 def main():
     print("=" * 70)
@@ -131,13 +136,15 @@ def main():
 
     try:
         device = testbed.devices["EUNIV-MAIN-PE1"]
-        device.connect(log_stdout=False, learn_hostname=True)
+        # One session per ping target so TEST 6 can run the pings concurrently
+        device.connect(log_stdout=False, learn_hostname=True, pool_size=len(PING_TARGETS))
 
         output = device.execute("show ip route 0.0.0.0")
         print(output)
 
         # Check if BGP default route is installed (learned from RRs)
-        if "bgp" in output.lower() and "0.0.0.0/0" in output:
+        output_lower = output.lower()
+        if "bgp" in output_lower and "0.0.0.0/0" in output:
             print("\n✅ Default route received via BGP")
             if "10.255.0.1" in output or "10.255.0.2" in output:
                 print("✅ Learned from Route Reflector (CORE1/CORE2)")
@@ -145,7 +152,7 @@ def main():
             print("\n✅ Default route pointing to INET-GW1 (PRIMARY)")
         elif "10.255.0.12" in output or "10.255.0.102" in output:
             print("\n⚠️  Default route pointing to INET-GW2 (BACKUP) - check INET-GW1")
-        elif "static" in output.lower():
+        elif "static" in output_lower:
             print("\n⚠️  Static default route (not BGP) - consider removing it")
         else:
             print("\n❌ No default route received!")
@@ -155,26 +162,27 @@ def main():
         print("TEST 6: Connectivity to Simulated Internet")
         print("─" * 70)
 
-        targets = ["8.8.8.8", "1.1.1.1", "9.9.9.9"]
+        # The pooled connection hands each thread its own session
+        with ThreadPoolExecutor(max_workers=len(PING_TARGETS)) as executor:
+            outputs = list(executor.map(
+                lambda target: device.execute(f"ping {target} repeat 3 timeout 2"),
+                PING_TARGETS,
+            ))
 
-        for target in targets:
-            output = device.execute(f"ping {target} repeat 3 timeout 2")
+        for target, output in zip(PING_TARGETS, outputs):
             print(f"\nPing {target}:")
 
             # Extract success rate
-            if "Success rate is 100" in output:
+            match = _SUCCESS_RE.search(output)
+            if not match:
+                print(f"  ? {target} - Unknown result")
+                print(output)
+            elif match.group(1) == "100":
                 print(f"  ✅ {target} - 100% success")
-            elif "Success rate is 0" in output:
+            elif match.group(1) == "0":
                 print(f"  ❌ {target} - 0% success (FAILED)")
             else:
-                # Extract actual success rate
-                match = re.search(r'Success rate is (\d+) percent', output)
-                if match:
-                    rate = match.group(1)
-                    print(f"  ⚠️  {target} - {rate}% success")
-                else:
-                    print(f"  ? {target} - Unknown result")
-                    print(output)
+                print(f"  ⚠️  {target} - {match.group(1)}% success")
 
         device.disconnect()
 